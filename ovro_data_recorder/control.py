@@ -506,8 +506,9 @@ class PowerBeamCommandProcessor(CommandProcessorBase):
     
     _commands = (Ping, Sync, HDF5Record, Cancel, Delete)
     
-    def __init__(self, log, id, directory, queue, shutdown_event=None):
+    def __init__(self, log, id, directory, queue, compression=None, shutdown_event=None):
         CommandProcessorBase.__init__(self, log, id, directory, queue, HDF5Writer,
+                                      filewriter_kwds={'compression': compression},
                                       shutdown_event=shutdown_event)
 
 
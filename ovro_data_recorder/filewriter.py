@@ -6,9 +6,10 @@ import time
 import numpy
 import atexit
 import shutil
-import subprocess
-from bisect import bisect_left, bisect_right
+import tarfile
+import logging
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from textwrap import fill as tw_fill
 
 from mnc.common import *
@@ -20,9 +21,59 @@ from ovro_data_recorder.lwams import *
 __all__ = ['FileWriterBase', 'DRXWriter', 'HDF5Writer', 'MeasurementSetWriter']
 
 
+# Logging instance
+filewriter_logger = logging.getLogger('__main__')
+
+
 # Temporary file directory
 _TEMP_BASEDIR = "/fast/pipeline/temp/"
 
+# Buffer size for reading/writing measurement set tarballs
+_TAR_BUFFER_SIZE = 4*1024**2
+
+# Integer version of the sample rate for working with time tags
+_FS_INT = int(round(FS))
+
+# UNIX epoch - the reference for time tags
+_UNIX_EPOCH = datetime(1970, 1, 1)
+
+
+def _datetime_to_timetag(dt):
+    """
+    Convert a naive UTC datetime instance into a time tag using integer
+    arithmetic.
+    """
+    
+    delta = dt - _UNIX_EPOCH
+    return (delta.days*86400 + delta.seconds)*_FS_INT + delta.microseconds*_FS_INT//1000000
+
+
+def _drop_from_page_cache(filename):
+    """
+    Advise the kernel that the contents of a file that has been written out
+    will not be read again by us so that it does not crowd the page cache.
+    The file is flushed to disk first since the kernel skips pages that are
+    still dirty or under writeback.  This blocks until the data are on disk
+    so it should not be called from a thread that is recording data.
+    """
+    
+    try:
+        fd = os.open(filename, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fdatasync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except (AttributeError, OSError):
+        pass
+    finally:
+        os.close(fd)
+
+
+# Background thread for flushing finished files and dropping them from the
+# page cache
+_PAGE_CACHE_POOL = ThreadPoolExecutor(max_workers=1)
+
 
 class FileWriterBase(object):
     """
@@ -99,9 +150,10 @@ class FileWriterBase(object):
         The current size of the file or None if the file does not exist yet.
         """
         
-        filesize = None
-        if os.path.exists(self.filename):
-            filesize = os.path.getsize(self.filename)
+        try:
+            filesize = os.stat(self.filename).st_size
+        except OSError:
+            filesize = None
         return filesize
         
     @property
@@ -111,9 +163,10 @@ class FileWriterBase(object):
         exist yet.
         """
         
-        filemtime = None
-        if os.path.exists(self.filename):
-            filemtime = os.path.getmtime(self.filename)
+        try:
+            filemtime = os.stat(self.filename).st_mtime
+        except OSError:
+            filemtime = None
         return filemtime
         
     def start(self, *args, **kwds):
@@ -143,6 +196,8 @@ class FileWriterBase(object):
             pass
             
         if os.path.exists(self.filename):
+            if os.path.isfile(self.filename):
+                _PAGE_CACHE_POOL.submit(_drop_from_page_cache, self.filename)
             try:
                 self.post_stop_task()
             except NotImplementedError:
@@ -192,23 +247,31 @@ class DRXWriter(FileWriterBase):
 class HDF5Writer(FileWriterBase):
     """
     Sub-class of :py:class:`FileWriterBase` that writes data to a HDF5 file.
+    The polarization products can optionally be compressed by setting
+    `compression` to a h5py compression filter name, e.g., 'gzip'.
     """
     
+    def __init__(self, filename, start_time, stop_time, reduction=None, compression=None):
+        FileWriterBase.__init__(self, filename, start_time, stop_time, reduction=reduction)
+        self.compression = compression
+        
     def start(self, beam, chan0, navg, nchan, chan_bw, npol, pols, **kwds):
         """
         Set the metadata in the HDF5 file and prepare it for writing.
         """
         
         # Reduction adjustments
-        freq = numpy.arange(nchan)*chan_bw + chan_to_freq(chan0)
         if self.reduction is not None:
+            ## Centers of the averaged channels
+            r = self.reduction.reductions[2]
+            freq = chan_to_freq(chan0) + chan_bw*((r - 1) / 2.0 + r*numpy.arange(nchan // r))
+            
             navg = navg * self.reduction.reductions[0]
             nchan = nchan // self.reduction.reductions[2]
             chan_bw = chan_bw * self.reduction.reductions[2]
             pols = self.reduction.pols
-            
-            freq = freq.reshape(-1, self.reduction.reductions[2])
-            freq = freq.mean(axis=1)
+        else:
+            freq = chan_to_freq(chan0) + chan_bw*numpy.arange(nchan)
             
         # Expected integration count
         chunks = int((self.stop_time - self.start_time).total_seconds() / (navg / CHAN_BW)) + 1
@@ -218,9 +281,11 @@ class HDF5Writer(FileWriterBase):
         self._freq = set_frequencies(self._interface, freq)
         self._time = set_time(self._interface, navg / CHAN_BW, chunks)
         self._time_step = navg * int(round(FS/CHAN_BW))
-        self._start_time_tag = LWATime(self.start_time, format='datetime', scale='utc').tuple
-        self._stop_time_tag = LWATime(self.stop_time, format='datetime', scale='utc').tuple
-        self._pols = set_polarization_products(self._interface, pols, chunks)
+        self._start_time_tag = _datetime_to_timetag(self.start_time)
+        self._stop_time_tag = _datetime_to_timetag(self.stop_time)
+        self._pols = set_polarization_products(self._interface, pols, chunks,
+                                               compression=self.compression)
+        self._write_scratch = numpy.empty((0, 0, 0), dtype=self._pols[0].dtype)
         self._counter = 0
         self._counter_max = chunks
         self._started = True
@@ -244,32 +309,37 @@ class HDF5Writer(FileWriterBase):
         if self.reduction is not None:
             data = self.reduction(data)
             
-        # Timestamps
-        time_tags = [LWATime(time_tag+i*self._time_step, format='timetag').tuple for i in range(data.shape[0])]
-        
-        # Data selection
-        if time_tags[0] < self._start_time_tag:
-            ## Lead in
-            offset = bisect_left(time_tags, self._start_time_tag)
-            size = min([self._counter_max - self._counter, len(time_tags) - offset])
-            range_start = offset
-        elif time_tags[-1] > self._stop_time_tag:
-            ## Flush out
-            offset = bisect_right(time_tags, self._stop_time_tag)
-            size = min([self._counter_max - self._counter, offset])
-            range_start = 0
-        else:
-            ## Fully contained
-            size = min([self._counter_max - self._counter, len(time_tags)])
-            range_start = 0
+        # Data selection - the time tags are an arithmetic sequence so the
+        # range of rows that falls within the file can be found directly
+        nrow = data.shape[0]
+        range_start = -((time_tag - self._start_time_tag) // self._time_step)
+        range_start = max([0, min([nrow, range_start])])
+        range_stop = (self._stop_time_tag - time_tag) // self._time_step + 1
+        range_stop = max([0, min([nrow, range_stop])])
+        size = min([self._counter_max - self._counter, range_stop - range_start])
+        if size <= 0:
+            return
             
+        # Timestamps
+        time_tags = time_tag + numpy.arange(range_start, range_start+size, dtype=numpy.int64)*self._time_step
+        time_values = numpy.empty(size, dtype=self._time.dtype)
+        time_values['int'] = time_tags // _FS_INT
+        time_values['frac'] = (time_tags % _FS_INT) / FS
+        
         try:
             # Write
             ## Timestamps
-            self._time[self._counter:self._counter+size] = time_tags[range_start:range_start+size]
-            ## Data
-            for i in range(data.shape[-1]):
-                self._pols[i][self._counter:self._counter+size,:] = data[range_start:range_start+size,0,:,i]
+            self._time[self._counter:self._counter+size] = time_values
+            ## Data - transpose to (pol, time, chan) so that each product is
+            ## a single contiguous block that can be handed directly to HDF5
+            if self._write_scratch.shape[1] < size:
+                self._write_scratch = numpy.empty((data.shape[-1], nrow, data.shape[2]),
+                                                  dtype=self._write_scratch.dtype)
+            block = self._write_scratch[:,:size,:]
+            numpy.copyto(block, data[range_start:range_start+size,0,:,:].transpose(2,0,1))
+            dest = numpy.s_[self._counter:self._counter+size,:]
+            for i in range(block.shape[0]):
+                self._pols[i].write_direct(block[i], dest_sel=dest)
             # Update the counter
             self._counter += size
             # Flush every 10 s
@@ -299,6 +369,9 @@ class MeasurementSetWriter(FileWriterBase):
             os.mkdir(self._tempdir)
         self.nint_per_file = nint_per_file
         self.is_tarred = is_tarred
+        self._save_pool = ThreadPoolExecutor(max_workers=1)
+        self._save_future = None
+        self._save_filename = None
         
         # Cleanup
         atexit.register(shutil.rmtree, self._tempdir, ignore_errors=True)
@@ -331,6 +404,7 @@ class MeasurementSetWriter(FileWriterBase):
         
         # Save
         self._station = station
+        self._frame = get_station_frame(station)
         self._tint = tint
         self._time_step = time_step
         self._nant = len(self._station.antennas)
@@ -362,12 +436,10 @@ class MeasurementSetWriter(FileWriterBase):
                 self._last_tagpath = self.tagpath
             self.tagname = "%s_%.0fMHz.ms" % (tstart.datetime.strftime('%Y%m%d_%H%M%S'), self._freq[0]/1e6)
             self.tempname = os.path.join(self._tempdir, self.tagname)
-            with open('/dev/null', 'wb') as dn:
-                subprocess.check_call(['cp', '-r', self._template, self.tempname],
-                                      stderr=dn)
+            shutil.copytree(self._template, self.tempname)
                 
         # Find the point overhead
-        zen = get_zenith(self._station, tcent)
+        zen = get_zenith(self._station, tcent, frame=self._frame)
         
         # Update the time
         update_time(self.tempname, self._counter, tstart, tcent, tstop)
@@ -381,28 +453,69 @@ class MeasurementSetWriter(FileWriterBase):
         # Save it to its final location
         self._counter += 1
         if self._counter == self._nint:
+            self._counter = 0
             self.tagname = os.path.join(self.tagpath, self.tagname)
             if self.is_tarred:
                 filename = os.path.join(self.filename, "%s.tar" % self.tagname)
-                save_cmd = ['tar', 'cf', filename, os.path.basename(self.tempname)]
             else:
                 filename = os.path.join(self.filename, self.tagname)
-                save_cmd = ['cp', '-rf', self.tempname, filename]
-            with open('/dev/null', 'wb') as dn:
-                try:
-                    subprocess.check_call(save_cmd, stderr=dn, cwd=self._tempdir)
-                    shutil.rmtree(self.tempname, ignore_errors=True)
-                    self._counter = 0
-                except subprocess.CalledProcessError as e:
-                    shutil.rmtree(self.tempname, ignore_errors=True)
-                    self._counter = 0
-                    raise e
-                    
+                
+            ## The save runs in the background so that it overlaps with the
+            ## next integration.  Only one save is allowed to be outstanding
+            ## and any error from the previous one is raised here, naming the
+            ## file that failed.
+            previous_save = self._save_future, self._save_filename
+            self._save_future = self._save_pool.submit(self._save, self.tempname, filename)
+            self._save_filename = filename
+            self._wait_for_save(*previous_save)
+            
+    @staticmethod
+    def _wait_for_save(future, filename):
+        """
+        Wait for a background save to finish and raise a RuntimeError that
+        names the file if it failed.
+        """
+        
+        if future is None:
+            return
+        try:
+            future.result()
+        except Exception as e:
+            raise RuntimeError(f"Failed to save '{filename}': {str(e)}") from e
+            
+    def _save(self, tempname, filename):
+        """
+        Move a completed measurement set from the temporary directory to its
+        final location, either as a tar file or as a copy.
+        """
+        
+        try:
+            if self.is_tarred:
+                with open(filename, 'wb', buffering=_TAR_BUFFER_SIZE) as fh:
+                    with tarfile.open(fileobj=fh, mode='w', format=tarfile.GNU_FORMAT,
+                                      copybufsize=_TAR_BUFFER_SIZE) as tf:
+                        tf.add(tempname, arcname=os.path.basename(tempname))
+                _drop_from_page_cache(filename)
+            else:
+                shutil.copytree(tempname, filename, dirs_exist_ok=True)
+        finally:
+            shutil.rmtree(tempname, ignore_errors=True)
+            
     def stop(self):
         """
         Close out the file and then call the 'post_stop_task' method.
         """
         
+        # Wait for any outstanding save to finish - there is no later write
+        # to report a failure from so log it here
+        try:
+            self._wait_for_save(self._save_future, self._save_filename)
+        except RuntimeError as e:
+            filewriter_logger.error(str(e))
+        self._save_pool.shutdown(wait=True)
+        self._save_future = None
+        self._save_filename = None
+        
         try:
             shutil.rmtree(self._template, ignore_errors=True)
         except OSError:
@@ -12,6 +12,14 @@ __all__ = ['create_hdf5', 'set_frequencies', 'set_time',
 
 HDF5_CHUNK_SIZE_MB = 32
 
+HDF5_CACHE_NSLOTS = 101
+
+HDF5_CACHE_W0 = 0.75
+
+HDF5_COMPRESSION = None
+
+HDF5_COMPRESSION_LEVEL = 1
+
 
 def create_hdf5(filename, beam, overwrite=False):
     """
@@ -115,11 +123,20 @@ def set_time(f, tint, count, format='unix', scale='utc'):
     return tim
 
 
-def set_polarization_products(f, pols, count):
+def set_polarization_products(f, pols, count, compression=HDF5_COMPRESSION,
+                              compression_opts=None):
     """
     Set the polarization products and create a data set for each.  Returns a
     dictionary of data sets keyed by the product name and its numeric index in
     the input.
+    
+    If `compression` is not None the data sets are compressed with it and use
+    the shuffle filter to improve the compression of the floating point data.
+    `compression_opts` is passed along to the filter and defaults to
+    HDF5_COMPRESSION_LEVEL for 'gzip'.  Compressed data sets also get a chunk
+    cache large enough to hold the chunk being filled so that it is not
+    compressed and then re-read as it fills.  Compression is off by default since compressing a full set of chunks can
+    take longer than the time it takes to record them.
     """
     
     obs = f.get('/Observation1', None)
@@ -130,6 +147,10 @@ def set_polarization_products(f, pols, count):
     if not isinstance(pols, (tuple, list)):
         pols = [p.strip().rstrip() for p in pols.split(',')]
         
+    # Only gzip takes a compression level
+    if compression == 'gzip' and compression_opts is None:
+        compression_opts = HDF5_COMPRESSION_LEVEL
+        
     data_products = {}
     for i,p in enumerate(pols):
         p = p.replace('CR', 'XY_real')
@@ -139,7 +160,17 @@ def set_polarization_products(f, pols, count):
         chunk_size = max([1, chunk_size])
         chunk_size = min([count, chunk_size])
         
-        d = tun.create_dataset(p, (count, nchan), '<f4', chunks=(chunk_size, nchan))
+        cache_kwds = {}
+        if compression is not None:
+            cache_kwds = {'rdcc_nbytes': 2 * chunk_size * nchan * 4,
+                          'rdcc_nslots': HDF5_CACHE_NSLOTS,
+                          'rdcc_w0': HDF5_CACHE_W0}
+            
+        d = tun.create_dataset(p, (count, nchan), '<f4', chunks=(chunk_size, nchan),
+                               compression=compression,
+                               compression_opts=compression_opts,
+                               shuffle=(compression is not None),
+                               **cache_kwds)
         d.attrs['axis0'] = 'time'
         d.attrs['axis1'] = 'frequency'
         data_products[i] = d
@@ -11,7 +11,7 @@ from casacore.tables import table, tableutil
 from mnc.common import LWATime
 from observing import obsstate
 
-__all__ = ['STOKES_CODES', 'NUMERIC_STOKES', 'get_zenith', 'get_zenith_uvw',
+__all__ = ['STOKES_CODES', 'NUMERIC_STOKES', 'get_station_frame', 'get_zenith', 'get_zenith_uvw',
            'create_ms', 'update_time', 'update_pointing', 'update_data']
 
 
@@ -35,19 +35,35 @@ FORCE_TABLE_FLUSH = False
 lwams_logger = logging.getLogger('__main__')
 
 
-def get_zenith(station, lwatime):
+def get_station_frame(station):
     """
-    Given a Station instance and a LWATime instance, return the RA and Dec
-    coordiantes of the zenith in radians (J2000).
+    Given a Station instance, return a casacore measures instance whose
+    reference frame is set to the location of the station.  This can be passed
+    to get_zenith to avoid setting up a new frame on every call.
     """
     
-    # This should be compatible with what data2ms does/did.
     dm = measures()
     zenith = dm.direction('AZEL', '0deg', '90deg')
     position = dm.position(*station.casa_position)
-    epoch = dm.epoch(*lwatime.casa_epoch)
     dm.doframe(zenith)
     dm.doframe(position)
+    return dm
+
+
+def get_zenith(station, lwatime, frame=None):
+    """
+    Given a Station instance and a LWATime instance, return the RA and Dec
+    coordiantes of the zenith in radians (J2000).  If a measures instance from
+    get_station_frame is provided as `frame` it is used in place of a new
+    one.
+    """
+    
+    # This should be compatible with what data2ms does/did.
+    dm = frame
+    if dm is None:
+        dm = get_station_frame(station)
+    zenith = dm.direction('AZEL', '0deg', '90deg')
+    epoch = dm.epoch(*lwatime.casa_epoch)
     dm.doframe(epoch)
     pointing = dm.measure(zenith, 'J2000')
     return pointing['m0']['value'], pointing['m1']['value']
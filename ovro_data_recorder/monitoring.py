@@ -1,9 +1,11 @@
 import os
-import glob
 import time
+import logging
 import threading
 from subprocess import Popen, DEVNULL
+from queue import SimpleQueue, Empty
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from bifrost.proclog import load_by_pid
@@ -16,40 +18,259 @@ __all__ = ['PerformanceLogger', 'DiskStorageLogger', 'TimeStorageLogger', 'Statu
 
 MINIMUM_TO_DELETE_PATH_LENGTH = len("/data$$/slow")
 
-def interruptable_sleep(seconds, sub_interval=0.1, shutdown_event=None):
+# Maximum age in seconds of a cached os.statvfs result
+STATVFS_CACHE_MAX_AGE = 60
+
+_STATVFS_CACHE = {}
+_STATVFS_CACHE_LOCK = threading.Lock()
+
+def interruptable_sleep(seconds, sub_interval=0.1, shutdown_event=None,
+                        max_wait=5.0):
     """
-    Version of sleep that breaks the `seconds` sleep period into sub-intervals
-    of length `sub_interval`.
+    Version of sleep that returns early if `shutdown_event` is set.  If an
+    event is provided the wait is broken into chunks of at most `max_wait`
+    seconds, otherwise the `seconds` sleep period is broken into sub-intervals
+    of length `sub_interval`.  The deadline is tracked with the monotonic clock
+    so that changes to the system time do not stretch the sleep.
     """
     
-    t0 = time.time()
-    t1 = t0 + seconds
+    t1 = time.monotonic() + seconds
     if shutdown_event is not None:
-        while time.time() < t1 and not shutdown_event.is_set():
-            time.sleep(sub_interval)
+        remaining = seconds
+        while remaining > 0:
+            if shutdown_event.wait(min(remaining, max_wait)):
+                break
+            remaining = t1 - time.monotonic()
     else:
-        while time.time() < t1:
+        while time.monotonic() < t1:
             time.sleep(sub_interval)
 
 
+def cached_statvfs(path, max_age=STATVFS_CACHE_MAX_AGE):
+    """
+    Version of os.statvfs that reuses the result of a previous call for the
+    same path if it is less than `max_age` seconds old.  The cache is shared
+    by all of the loggers in a process.
+    """
+    
+    t_now = time.monotonic()
+    with _STATVFS_CACHE_LOCK:
+        try:
+            t_st, st = _STATVFS_CACHE[path]
+            if t_now - t_st < max_age:
+                return st
+        except KeyError:
+            pass
+            
+    st = os.statvfs(path)
+    with _STATVFS_CACHE_LOCK:
+        _STATVFS_CACHE[path] = (t_now, st)
+    return st
+
+
+def _list_directory(dirname):
+    """
+    Return a sorted list of the paths of the entries in a directory, skipping
+    hidden entries like glob does.  If `dirname` does not exist or is not a
+    directory an empty list is returned.
+    """
+    
+    try:
+        with os.scandir(dirname) as items:
+            filenames = [name.path for name in items if not name.name.startswith('.')]
+    except (FileNotFoundError, NotADirectoryError):
+        filenames = []
+    filenames.sort()
+    return filenames
+
+
 def getsize(filename):
     """
     Version of os.path.getsize that walks directories to get their total sizes.
+    `filename` can also be an os.DirEntry from os.scandir, in which case the
+    file type information cached on the entry is used instead of another stat.
     """
     
-    if os.path.isdir(filename):
+    if isinstance(filename, os.DirEntry):
+        is_dir = filename.is_dir(follow_symlinks=False)
+    else:
+        is_dir = os.path.isdir(filename)
+        
+    if is_dir:
         filesize = 0
         with os.scandir(filename) as items:
             for name in items:
-                if name.is_file():
-                    filesize += name.stat().st_size
-                elif name.is_dir():
-                    filesize += getsize(name.path)
+                if name.is_file(follow_symlinks=False):
+                    filesize += name.stat(follow_symlinks=False).st_size
+                elif name.is_dir(follow_symlinks=False):
+                    filesize += getsize(name)
+    elif isinstance(filename, os.DirEntry):
+        filesize = filename.stat(follow_symlinks=False).st_size
     else:
         filesize = os.path.getsize(filename)
     return filesize
 
 
+class _PathRemover(object):
+    """
+    Helper for the storage loggers that removes paths in the background with
+    '/bin/rm -rf' so that quota management does not block the monitoring loop.
+    Paths are removed in batches of `batch_size` by up to `max_workers`
+    threads and are reported as pending until their batch has finished.
+    """
+    
+    def __init__(self, owner, max_workers=4, batch_size=100):
+        self.owner = owner
+        self.batch_size = batch_size
+        
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._batch = 0
+        
+    def is_pending(self, path):
+        """
+        Whether or not the specified path is queued for removal.
+        """
+        
+        with self._lock:
+            return path in self._pending
+            
+    def submit(self, paths):
+        """
+        Queue a list of paths for removal.
+        """
+        
+        for i in range(0, len(paths), self.batch_size):
+            chunk = paths[i:i+self.batch_size]
+            with self._lock:
+                self._pending.update(chunk)
+                self._batch += 1
+                batch = self._batch
+            self._pool.submit(self._remove, chunk, batch)
+            
+    def _remove(self, chunk, batch):
+        log = self.owner.log
+        try:
+            remove_process = Popen(['/bin/rm', '-rf'] + chunk, stdout=DEVNULL, stderr=DEVNULL)
+            while remove_process.poll() is None:
+                if self.owner.shutdown_event.wait(1):
+                    remove_process.kill()
+                    log.warning('Quota: Failed to remove %i items - batch #%i took too long, giving up', len(chunk), batch)
+                    return
+            log.debug('Quota: Removed %i items.', len(chunk))
+        except OSError as e:
+            log.warning('Quota: Failed to remove %i items - %s', len(chunk), e)
+        finally:
+            with self._lock:
+                self._pending.difference_update(chunk)
+                
+    def shutdown(self):
+        """
+        Wait for all queued removals to finish or be abandoned.
+        """
+        
+        self._pool.shutdown(wait=True)
+
+
+class _SharedClient(Client):
+    """
+    Sub-class of :py:class:`mnc.mcs.Client` that also keeps the latest value
+    written to each monitoring point in a dictionary.  This dictionary can be
+    shared between the loggers of a pipeline so that reads of points written
+    in the same process do not need a round trip to the MCS.
+    
+    If `background` is True the writes to the MCS are queued and sent by a
+    separate thread so that a slow MCS does not hold up the caller.  Repeated
+    writes to the same point that are waiting in the queue are collapsed into
+    the most recent one.  Failed background writes are reported through `log`,
+    if it is provided.
+    """
+    
+    _DRAIN_BATCH_SIZE = 64
+    
+    def __init__(self, id, shared_points=None, background=False, log=None):
+        Client.__init__(self, id)
+        if shared_points is None:
+            shared_points = {}
+        self._shared_points = shared_points
+        self._log = log
+        
+        self._queue = None
+        self._drain_thread = None
+        if background:
+            self._queue = SimpleQueue()
+            self._drain_thread = threading.Thread(target=self._drain, args=(self._queue,),
+                                                  daemon=True)
+            self._drain_thread.start()
+            
+    def _drain(self, queue):
+        done = False
+        while not done:
+            ## Wait for something to write and then grab whatever else is
+            ## already waiting, keeping only the latest value for each point
+            batch = {}
+            item = queue.get()
+            while True:
+                if item is None:
+                    done = True
+                    break
+                batch[item[0]] = item[1:]
+                if len(batch) >= self._DRAIN_BATCH_SIZE:
+                    break
+                try:
+                    item = queue.get_nowait()
+                except Empty:
+                    break
+                    
+            for name, (value, timestamp, unit, kwds) in batch.items():
+                ## If close() gave up on this queue the writes now go directly
+                ## to the MCS - stop so that stale values are not sent after
+                ## newer ones
+                if queue is not self._queue:
+                    return
+                try:
+                    Client.write_monitor_point(self, name, value, timestamp=timestamp, unit=unit, **kwds)
+                except Exception as e:
+                    if self._log is not None:
+                        self._log.warning("Failed to write monitoring point '%s': %s", name, e)
+                    
+    def write_monitor_point(self, name, value, timestamp=None, unit='', **kwds):
+        if timestamp is None:
+            timestamp = time.time()
+        self._shared_points[name] = MonitorPoint(value, timestamp=timestamp, unit=unit)
+        if self._queue is not None:
+            self._queue.put((name, value, timestamp, unit, kwds))
+            return True
+        return Client.write_monitor_point(self, name, value, timestamp=timestamp, unit=unit, **kwds)
+        
+    def close(self, timeout=5.0):
+        """
+        Send any queued writes and stop the background thread, if there is
+        one, waiting at most `timeout` seconds for the queue to drain.  Any
+        writes still queued after that are dropped.  Later writes go directly
+        to the MCS.
+        """
+        
+        if self._queue is not None:
+            self._queue.put(None)
+            self._drain_thread.join(timeout)
+            if self._drain_thread.is_alive():
+                if self._log is not None:
+                    self._log.warning("Gave up waiting for the queued monitoring point writes after %.1f s",
+                                      timeout)
+            self._queue = None
+            self._drain_thread = None
+            
+    def read_monitor_point(self, name, *args, **kwds):
+        if not args and not kwds:
+            try:
+                return self._shared_points[name]
+            except KeyError:
+                pass
+        return Client.read_monitor_point(self, name, *args, **kwds)
+
+
 class PerformanceLogger(object):
     """
     Monitoring class for logging how a Bifrost pipeline is performing.  This
@@ -57,7 +278,8 @@ class PerformanceLogger(object):
     as the RX rate and missing packet fraction.
     """
     
-    def __init__(self, log, id, queue=None, shutdown_event=None, update_interval=10):
+    def __init__(self, log, id, queue=None, shutdown_event=None, update_interval=10,
+                 shared_points=None):
         self.log = log
         self.id = id
         self.queue = queue
@@ -66,10 +288,11 @@ class PerformanceLogger(object):
         self.shutdown_event = shutdown_event
         self.update_interval = update_interval
         
-        self.client = Client(id)
+        self.client = _SharedClient(id, shared_points=shared_points)
         
         self._pid = os.getpid()
         self._state = deque([], 2)
+        self._capture_key = None
         self._reset()
         self._update()
         
@@ -92,6 +315,14 @@ class PerformanceLogger(object):
         
         self._state.append((new_state_time,new_state))
         
+        # The block layout does not change while the pipeline is running so
+        # we only need to find the capture block once
+        if self._capture_key is None:
+            for block in new_state.keys():
+                if block[-8:] == '_capture':
+                    self._capture_key = block
+                    break
+        
     def _halt(self):
         self._reset()
         
@@ -102,12 +333,13 @@ class PerformanceLogger(object):
         """
         
         while not self.shutdown_event.is_set():
-            # Update the state
-            t0 = time.time()
+            # Update the state - all monitoring points for this cycle share
+            # the same timestamp
+            t0 = time.monotonic()
+            ts = time.time()
             self._update()
             
             # Get the pipeline lag, is possible
-            ts = time.time()
             lag = None
             if self.queue is not None:
                 lag = self.queue.lag.total_seconds()
@@ -115,14 +347,19 @@ class PerformanceLogger(object):
                                                 lag, timestamp=ts, unit='s')
                 
             # Find the maximum acquire/process/reserve times
-            ts = time.time()
             acquire, process, reserve = 0.0, 0.0, 0.0
             for block,contents in self._state[1][1].items():
                 try:
                     perf = contents['perf']
-                    acquire = max([acquire, perf['acquire_time']])
-                    process = max([process, perf['process_time']])
-                    reserve = max([reserve, perf['reserve_time']])
+                    value = perf['acquire_time']
+                    if value > acquire:
+                        acquire = value
+                    value = perf['process_time']
+                    if value > process:
+                        process = value
+                    value = perf['reserve_time']
+                    if value > reserve:
+                        reserve = value
                 except KeyError:
                     continue
             self.client.write_monitor_point('bifrost/max_acquire',
@@ -133,23 +370,22 @@ class PerformanceLogger(object):
                                             reserve, timestamp=ts, unit='s')
             
             # Estimate the data rate and current missing data fracation
-            ts = time.time()
             rx_valid, rx_rate, missing_fraction = False, 0.0, 0.0
             good0, late0, missing0 = 0, 0, 0
             good1, late1, missing1 = 0, 0, 0
             try:
-                for block,contents in self._state[0][1].items():
-                    if block[-8:] == '_capture':
-                        rx_valid = True
-                        good0 = contents['stats']['ngood_bytes']
-                        late0 = contents['stats']['nlate_bytes']
-                        missing0 = contents['stats']['nmissing_bytes']
-                for block,contents in self._state[1][1].items():
-                    if block[-8:] == '_capture':
-                        good1 = contents['stats']['ngood_bytes']
-                        late1 = contents['stats']['nlate_bytes']
-                        missing1 = contents['stats']['nmissing_bytes']
-                        
+                if self._capture_key is not None:
+                    stats = self._state[0][1][self._capture_key]['stats']
+                    rx_valid = True
+                    good0 = stats['ngood_bytes']
+                    late0 = stats['nlate_bytes']
+                    missing0 = stats['nmissing_bytes']
+                    
+                    stats = self._state[1][1][self._capture_key]['stats']
+                    good1 = stats['ngood_bytes']
+                    late1 = stats['nlate_bytes']
+                    missing1 = stats['nmissing_bytes']
+                    
                 rx_rate = (good1 - good0) / (self._state[1][0] - self._state[0][0])
                 missing_fraction = (missing1 - missing0) / (good1 - good0 + missing1 - missing0)
                 
@@ -162,7 +398,6 @@ class PerformanceLogger(object):
                                             missing_fraction, timestamp=ts)
             
             # Load average
-            ts = time.time()
             try:
                 one, five, fifteen = os.getloadavg()
                 self.client.write_monitor_point('system/load_average/one_minute',
@@ -175,23 +410,24 @@ class PerformanceLogger(object):
                 one, five, fifteen = None, None, None
                 
             # Report
-            self.log.debug("=== Performance Report ===")
-            self.log.debug(" max acquire/process/reserve times: %.3f/%.3f/%.3f", acquire, process, reserve)
-            if rx_valid:
-                self.log.debug(" receive data rate: %.3f B/s", rx_rate)
-                self.log.debug(" missing data fraction: %.3f%%", missing_fraction*100.0)
-            if lag is not None:
-                self.log.debug(" pipeline lag: %s", lag)
-            if one is not None:
-                self.log.debug(" load average: %.2f, %.2f, %.2f", one, five, fifteen)
-            self.log.debug(" elapsed time: %.3f s", time.time()-t0)
-            self.log.debug("===   ===")
+            if self.log.isEnabledFor(logging.DEBUG):
+                self.log.debug("=== Performance Report ===")
+                self.log.debug(" max acquire/process/reserve times: %.3f/%.3f/%.3f", acquire, process, reserve)
+                if rx_valid:
+                    self.log.debug(" receive data rate: %.3f B/s", rx_rate)
+                    self.log.debug(" missing data fraction: %.3f%%", missing_fraction*100.0)
+                if lag is not None:
+                    self.log.debug(" pipeline lag: %s", lag)
+                if one is not None:
+                    self.log.debug(" load average: %.2f, %.2f, %.2f", one, five, fifteen)
+                self.log.debug(" elapsed time: %.3f s", time.monotonic()-t0)
+                self.log.debug("===   ===")
             
             # Sleep
             if once:
                 break
                 
-            t1 = time.time()
+            t1 = time.monotonic()
             t_sleep = max([1.0, self.update_interval - (t1 - t0)])
             interruptable_sleep(t_sleep, shutdown_event=self.shutdown_event)
             
@@ -206,7 +442,8 @@ class DiskStorageLogger(object):
     a directory quota, if needed.
     """
     
-    def __init__(self, log, id, directory, quota=None, shutdown_event=None, update_interval=3600):
+    def __init__(self, log, id, directory, quota=None, shutdown_event=None, update_interval=3600,
+                 shared_points=None):
         self.log = log
         self.id = id
         self.directory = directory
@@ -218,13 +455,15 @@ class DiskStorageLogger(object):
         self.shutdown_event = shutdown_event
         self.update_interval = update_interval
         
-        self.client = Client(id)
+        self.client = _SharedClient(id, shared_points=shared_points, background=True,
+                                    log=self.log)
+        self._remover = _PathRemover(self)
         
         self._reset()
         
     def _reset(self):
-        self._files = deque()
-        self._file_sizes = deque()
+        self._file_info = {}
+        self._total_size = 0
         
         ts = time.time()
         self.client.write_monitor_point('storage/active_disk_size',
@@ -239,39 +478,59 @@ class DiskStorageLogger(object):
                                         0, timestamp=ts)
         
     def _update(self):
-        self.log.debug(f"DiskStorageLogger: Updating storage usage in {self.directory}.")
+        self.log.debug("DiskStorageLogger: Updating storage usage in %s.", self.directory)
+        new_file_info, new_total_size = {}, 0
         try:
-            current_files = glob.glob(os.path.join(self.directory, '*'))
-            current_files.sort()    # The files should have sensible names that
-                                    # reflect their creation times
-            
-            new_files, new_file_sizes = deque(), deque()
-            for filename in current_files:
+            ## A missing directory is treated as empty, like _list_directory
+            try:
+                with os.scandir(self.directory) as items:
+                    current_files = [entry for entry in items if not entry.name.startswith('.')]
+            except (FileNotFoundError, NotADirectoryError):
+                current_files = []
+            current_files.sort(key=lambda x: x.name)    # The files should have sensible names that
+                                                        # reflect their creation times
+                                                        
+            for entry in current_files:
+                filename = entry.path
+                if self._remover.is_pending(filename):
+                    continue
+                ## lstat() results are cached on the entry by scandir so this
+                ## does not cost another syscall
+                info = entry.stat(follow_symlinks=False)
+                mtime = info.st_mtime
                 try:
-                    i = self._files.index(filename)
-                    new_files.append(filename)
-                    new_file_sizes.append(self._file_sizes[i])
-                except ValueError:
-                    size = getsize(filename)
-                    new_files.append(filename)
-                    new_file_sizes.append(size)
+                    ## Reuse the size from the last update if the entry has
+                    ## not been modified since then
+                    size, last_mtime = self._file_info[filename]
+                    if mtime != last_mtime:
+                        raise KeyError(filename)
+                except KeyError:
+                    if entry.is_dir(follow_symlinks=False):
+                        size = getsize(entry)
+                    else:
+                        size = info.st_size
+                new_file_info[filename] = (size, mtime)
+                new_total_size += size
         except Exception as e:
-            self.log.warning("Quota manager could not refresh the file list: %s", str(e))
-        self._files = new_files
-        self._file_sizes = new_file_sizes
+            self.log.warning("Quota manager could not refresh the file list: %s", e)
+        self._file_info = new_file_info
+        self._total_size = new_total_size
  
     def _halt(self):
+        self._remover.shutdown()
         self._reset()
+        self.client.close()
         
     def _manage_quota(self):
-        t0 = time.time()
-        total_size = sum(self._file_sizes)
+        t0 = time.monotonic()
         
         to_remove = []
         to_remove_size = 0
-        while total_size - to_remove_size > self.quota and len(self._files) > 1:
-            fn = self._files.popleft()
-            f_size = self._file_sizes.popleft()
+        nremain = len(self._file_info)
+        for fn,(f_size,_) in self._file_info.items():
+            # Entries are ordered oldest first; always keep at least one
+            if self._total_size <= self.quota or nremain <= 1:
+                break
             if (len(fn) <= len(self.directory)) or \
                 (not fn.startswith(self.directory)) or \
                     (len(fn) <= MINIMUM_TO_DELETE_PATH_LENGTH):
@@ -281,27 +540,19 @@ class DiskStorageLogger(object):
             else:
                 to_remove.append(fn)
                 to_remove_size += f_size
+                self._total_size -= f_size
+                nremain -= 1
+        for fn in to_remove:
+            del self._file_info[fn]
         self.log.debug("Quota: Number of items to remove: %i", len(to_remove))
         if to_remove:
-            batch = 0
-            for chunk in [to_remove[i:i+100] for i in range(0, len(to_remove), 100)]:
-                batch += 1
-                try:
-                    remove_process = Popen(['/bin/rm', '-rf'] + chunk, stdout=DEVNULL, stderr=DEVNULL)
-                    while remove_process.poll() is None:
-                        self.shutdown_event.wait(20)
-                        if self.shutdown_event.is_set():
-                            remove_process.kill()
-                            self.log.warning('Quota: Failed to remove %i items - batch #%i took too long, giving up', len(chunk), batch)
-                            return
-                    self.log.debug('Quota: Removed %i items.', len(chunk))
-                except OSError as e:
-                    self.log.warning('Quota: Failed to remove %i items - %s', len(chunk), str(e))
-            self.log.debug("=== Quota Report ===")
-            self.log.debug(" items removed: %i", len(to_remove))
-            self.log.debug(" space freed: %i B", to_remove_size)
-            self.log.debug(" elapsed time: %.3f s", time.time()-t0)
-            self.log.debug("===   ===")
+            self._remover.submit(to_remove)
+            if self.log.isEnabledFor(logging.DEBUG):
+                self.log.debug("=== Quota Report ===")
+                self.log.debug(" items queued for removal: %i", len(to_remove))
+                self.log.debug(" space to be freed: %i B", to_remove_size)
+                self.log.debug(" elapsed time: %.3f s", time.monotonic()-t0)
+                self.log.debug("===   ===")
             
     def main(self, once=False):
         """
@@ -311,44 +562,41 @@ class DiskStorageLogger(object):
         
         while not self.shutdown_event.is_set():
             # Update the state
-            t0 = time.time()
+            t0 = time.monotonic()
             self._update()
             
             # Find the disk size and free space for the disk hosting the
-            # directory - this should be quota-aware
+            # directory - this should be quota-aware.  All of the monitoring
+            # points for this cycle share the same timestamp.
             ts = time.time()
+            wmp = self.client.write_monitor_point
             try:
-                st = os.statvfs(self.directory)
+                st = cached_statvfs(self.directory)
                 disk_free = st.f_bavail * st.f_frsize
                 disk_total = st.f_blocks * st.f_frsize
             except OSError as e:
-                self.log.warning(f"Failed to statvfs '{self.directory}': {str(e)}")
+                self.log.warning("Failed to statvfs '%s': %s", self.directory, e)
                 disk_free = disk_total = 0
-            self.client.write_monitor_point('storage/active_disk_size',
-                                            disk_total, timestamp=ts, unit='B')
-            self.client.write_monitor_point('storage/active_disk_free',
-                                            disk_free, timestamp=ts, unit='B')
+            wmp('storage/active_disk_size', disk_total, timestamp=ts, unit='B')
+            wmp('storage/active_disk_free', disk_free, timestamp=ts, unit='B')
             
             # Find the total size of all files
-            ts = time.time()
-            total_size = sum(self._file_sizes)
-            file_count = len(self._files)
-            self.client.write_monitor_point('storage/active_directory',
-                                            self.directory, timestamp=ts)
-            self.client.write_monitor_point('storage/active_directory_size',
-                                            total_size, timestamp=ts, unit='B')
-            self.client.write_monitor_point('storage/active_directory_count',
-                                            file_count, timestamp=ts)
+            total_size = self._total_size
+            file_count = len(self._file_info)
+            wmp('storage/active_directory', self.directory, timestamp=ts)
+            wmp('storage/active_directory_size', total_size, timestamp=ts, unit='B')
+            wmp('storage/active_directory_count', file_count, timestamp=ts)
             
             # Report
-            self.log.debug("=== Storage Report ===")
-            self.log.debug(" directory: %s", self.directory)
-            self.log.debug(" disk size: %i B", disk_total)
-            self.log.debug(" disk free: %i B", disk_free)
-            self.log.debug(" file count: %i", file_count)
-            self.log.debug(" total size: %i B", total_size)
-            self.log.debug(" elapsed time: %.3f s", time.time()-t0)
-            self.log.debug("===   ===")
+            if self.log.isEnabledFor(logging.DEBUG):
+                self.log.debug("=== Storage Report ===")
+                self.log.debug(" directory: %s", self.directory)
+                self.log.debug(" disk size: %i B", disk_total)
+                self.log.debug(" disk free: %i B", disk_free)
+                self.log.debug(" file count: %i", file_count)
+                self.log.debug(" total size: %i B", total_size)
+                self.log.debug(" elapsed time: %.3f s", time.monotonic()-t0)
+                self.log.debug("===   ===")
             
             # Quota management, if needed
             if self.quota is not None:
@@ -358,7 +606,7 @@ class DiskStorageLogger(object):
             if once:
                 break
                 
-            t1 = time.time()
+            t1 = time.monotonic()
             t_sleep = max([1.0, self.update_interval - (t1 - t0)])
             interruptable_sleep(t_sleep, shutdown_event=self.shutdown_event)
             
@@ -381,7 +629,8 @@ class TimeStorageLogger(object):
     directories and deletions are done at the YYYY-MM-DD and HH levels.
     """
     
-    def __init__(self, log, id, directory, quota=None, shutdown_event=None, update_interval=3600):
+    def __init__(self, log, id, directory, quota=None, shutdown_event=None, update_interval=3600,
+                 shared_points=None):
         self.log = log
         self.id = id
         self.directory = directory
@@ -393,7 +642,9 @@ class TimeStorageLogger(object):
         self.shutdown_event = shutdown_event
         self.update_interval = update_interval
         
-        self.client = Client(id)
+        self.client = _SharedClient(id, shared_points=shared_points, background=True,
+                                    log=self.log)
+        self._remover = _PathRemover(self)
         
         self._reset()
         
@@ -418,19 +669,22 @@ class TimeStorageLogger(object):
         if frequency_Hz is not None:
             active_dir = os.path.join(active_dir, f"{frequency_Hz/1e6:.0f}MHz")
             
-        self.log.debug(f"TimeStorageLogger: Updating storage usage in {active_dir}.")
+        self.log.debug("TimeStorageLogger: Updating storage usage in %s.", active_dir)
         try:
-            current_files = glob.glob(os.path.join(active_dir, '*'))
-            current_files.sort()    # The files should have sensible names that
-                                    # reflect their creation times
+            current_files = _list_directory(active_dir)     # The files should have sensible names that
+                                                            # reflect their creation times
             
             t_now = datetime.utcnow()
             new_files, new_file_ages = deque(), deque()
             for filename in current_files:
+                # Skip anything that is already being removed
+                if self._remover.is_pending(filename):
+                    continue
+                    
                 # For each top level YYYY-MM-DD directory, find all of its sub-
                 # directories
                 batch_filenames = [filename,]
-                batch_filenames.extend(glob.glob(os.path.join(filename, '*')))
+                batch_filenames.extend([fn for fn in _list_directory(filename) if not self._remover.is_pending(fn)])
                 
                 # For each entry, come up with a global retention flag and an
                 # age
@@ -468,15 +722,17 @@ class TimeStorageLogger(object):
                 new_files.extend(batch_filenames)
                 new_file_ages.extend(batch_ages)
         except Exception as e:
-            self.log.warning("Quota manager could not refresh the file list: %s", str(e))
+            self.log.warning("Quota manager could not refresh the file list: %s", e)
         self._files = new_files
         self._file_ages = new_file_ages
  
     def _halt(self):
+        self._remover.shutdown()
         self._reset()
+        self.client.close()
         
     def _manage_quota(self):
-        t0 = time.time()
+        t0 = time.monotonic()
         
         to_remove = []
         to_remove_oldest = 0
@@ -495,25 +751,13 @@ class TimeStorageLogger(object):
                             to_remove_oldest = fa
         self.log.debug("Quota: Number of items to remove: %i", len(to_remove))
         if to_remove:
-            batch = 0
-            for chunk in [to_remove[i:i+100] for i in range(0, len(to_remove), 100)]:
-                batch += 1
-                try:
-                    remove_process = Popen(['/bin/rm', '-rf'] + chunk, stdout=DEVNULL, stderr=DEVNULL)
-                    while remove_process.poll() is None:
-                        self.shutdown_event.wait(20)
-                        if self.shutdown_event.is_set():
-                            remove_process.kill()
-                            self.log.warning('Quota: Failed to remove %i items - batch #%i took too long, giving up', len(chunk), batch)
-                            return
-                    self.log.debug('Quota: Removed %i items.', len(chunk))
-                except OSError as e:
-                    self.log.warning('Quota: Failed to remove %i items - %s', len(chunk), str(e))
-            self.log.debug("=== Quota Report ===")
-            self.log.debug(" items removed: %i", len(to_remove))
-            self.log.debug(" oldest item removed: %.3f hr", (to_remove_oldest/3600.))
-            self.log.debug(" elapsed time: %.3f s", time.time()-t0)
-            self.log.debug("===   ===")
+            self._remover.submit(to_remove)
+            if self.log.isEnabledFor(logging.DEBUG):
+                self.log.debug("=== Quota Report ===")
+                self.log.debug(" items queued for removal: %i", len(to_remove))
+                self.log.debug(" oldest item removed: %.3f hr", (to_remove_oldest/3600.))
+                self.log.debug(" elapsed time: %.3f s", time.monotonic()-t0)
+                self.log.debug("===   ===")
             
     def main(self, once=False):
         """
@@ -523,45 +767,43 @@ class TimeStorageLogger(object):
         
         while not self.shutdown_event.is_set():
             # Update the state
-            t0 = time.time()
+            t0 = time.monotonic()
             active_freq = self.client.read_monitor_point('latest_frequency')
             if active_freq is not None:
                 if active_freq.value is not None:
                     self._update(frequency_Hz=active_freq.value)
                     
             # Find the disk size and free space for the disk hosting the
-            # directory - this should be quota-aware
+            # directory - this should be quota-aware.  All of the monitoring
+            # points for this cycle share the same timestamp.
             ts = time.time()
+            wmp = self.client.write_monitor_point
             try:
-                st = os.statvfs(self.directory)
+                st = cached_statvfs(self.directory)
                 disk_free = st.f_bavail * st.f_frsize
                 disk_total = st.f_blocks * st.f_frsize
             except OSError as e:
-                self.log.warning(f"Failed to statvfs '{self.directory}': {str(e)}")
+                self.log.warning("Failed to statvfs '%s': %s", self.directory, e)
                 disk_free = disk_total = 0
-            self.client.write_monitor_point('storage/active_disk_size',
-                                            disk_total, timestamp=ts, unit='B')
-            self.client.write_monitor_point('storage/active_disk_free',
-                                            disk_free, timestamp=ts, unit='B')
+            wmp('storage/active_disk_size', disk_total, timestamp=ts, unit='B')
+            wmp('storage/active_disk_free', disk_free, timestamp=ts, unit='B')
             
             # Find the total size of all files
-            ts = time.time()
             file_count = len(self._files)
             file_oldest = max(self._file_ages, default=0.0)
             file_newest = min(self._file_ages, default=0.0)
-            self.client.write_monitor_point('storage/active_directory',
-                                            self.directory, timestamp=ts)
-            self.client.write_monitor_point('storage/active_directory_count',
-                                            file_count, timestamp=ts)
+            wmp('storage/active_directory', self.directory, timestamp=ts)
+            wmp('storage/active_directory_count', file_count, timestamp=ts)
             
             # Report
-            self.log.debug("=== Storage Report ===")
-            self.log.debug(" directory: %s", self.directory)
-            self.log.debug(" disk size: %i B", disk_total)
-            self.log.debug(" disk free: %i B", disk_free)
-            self.log.debug(" age range: %.3f to %.3f hr", (file_newest/3600.), (file_oldest)/3600.0)
-            self.log.debug(" elapsed time: %.3f s", time.time()-t0)
-            self.log.debug("===   ===")
+            if self.log.isEnabledFor(logging.DEBUG):
+                self.log.debug("=== Storage Report ===")
+                self.log.debug(" directory: %s", self.directory)
+                self.log.debug(" disk size: %i B", disk_total)
+                self.log.debug(" disk free: %i B", disk_free)
+                self.log.debug(" age range: %.3f to %.3f hr", (file_newest/3600.), (file_oldest)/3600.0)
+                self.log.debug(" elapsed time: %.3f s", time.monotonic()-t0)
+                self.log.debug("===   ===")
             
             # Quota management, if needed
             if self.quota is not None:
@@ -572,7 +814,7 @@ class TimeStorageLogger(object):
             if once:
                 break
                 
-            t1 = time.time()
+            t1 = time.monotonic()
             t_sleep = max([1.0, self.update_interval - (t1 - t0)])
             interruptable_sleep(t_sleep, shutdown_event=self.shutdown_event)
             
@@ -589,7 +831,7 @@ class StatusLogger(object):
     """
     
     def __init__(self, log, id, queue, thread_names=None, gulp_time=None,
-                 shutdown_event=None, update_interval=10):
+                 shutdown_event=None, update_interval=10, shared_points=None):
         self.log = log
         self.id = id
         self.queue = queue
@@ -600,7 +842,7 @@ class StatusLogger(object):
         self.shutdown_event = shutdown_event
         self.update_interval = update_interval
         
-        self.client = Client(id)
+        self.client = _SharedClient(id, shared_points=shared_points)
         self.last_summary = 'booting'
         self._reset()
         
@@ -671,7 +913,8 @@ class StatusLogger(object):
         
         while not self.shutdown_event.is_set():
             # Active operation
-            ts = t0 = time.time()
+            t0 = time.monotonic()
+            ts = time.time()
             is_active = False if self.queue.active is None else True
             is_waiting = False
             active_filename = None
@@ -812,22 +1055,23 @@ class StatusLogger(object):
             self.last_summary = summary
             
             # Report
-            self.log.debug("=== Status Report ===")
-            self.log.debug(" summary: %s", summary)
-            self.log.debug(" info: %s", info)
-            self.log.debug(" queue size: %i", len(self.queue))
-            self.log.debug(" active operation: %s", is_active)
-            if is_active:
-                self.log.debug(" active filename: %s", os.path.basename(active_filename))
-                self.log.debug(" active time remaining: %s", time_left)
-            self.log.debug(" elapsed time: %.3f s", time.time()-t0)
-            self.log.debug("===   ===")
+            if self.log.isEnabledFor(logging.DEBUG):
+                self.log.debug("=== Status Report ===")
+                self.log.debug(" summary: %s", summary)
+                self.log.debug(" info: %s", info)
+                self.log.debug(" queue size: %i", len(self.queue))
+                self.log.debug(" active operation: %s", is_active)
+                if is_active:
+                    self.log.debug(" active filename: %s", os.path.basename(active_filename))
+                    self.log.debug(" active time remaining: %s", time_left)
+                self.log.debug(" elapsed time: %.3f s", time.monotonic()-t0)
+                self.log.debug("===   ===")
             
             # Sleep
             if once:
                 break
                 
-            t1 = time.time()
+            t1 = time.monotonic()
             t_sleep = max([1.0, self.update_interval - (t1 - t0)])
             interruptable_sleep(t_sleep, shutdown_event=self.shutdown_event)
             
@@ -886,15 +1130,22 @@ class GlobalLogger(object):
         if threads is None:
             thread_names = None
             
+        # Monitoring points written by the loggers that are shared so that
+        # StatusLogger can read them without going through the MCS
+        self._shared_points = {}
+        
         self.perf = PerformanceLogger(log, id, queue, shutdown_event=shutdown_event,
-                                      update_interval=update_interval_perf)
+                                      update_interval=update_interval_perf,
+                                      shared_points=self._shared_points)
         self.storage = SLC(log, id, args.record_directory, quota=quota,
                             shutdown_event=shutdown_event,
-                            update_interval=update_interval_storage)
+                            update_interval=update_interval_storage,
+                            shared_points=self._shared_points)
         self.status = StatusLogger(log, id, queue, thread_names=thread_names,
                                    gulp_time=gulp_time,
                                    shutdown_event=shutdown_event,
-                                   update_interval=update_interval_status)
+                                   update_interval=update_interval_status,
+                                   shared_points=self._shared_points)
         
     @property
     def shutdown_event(self):
@@ -927,8 +1178,8 @@ class GlobalLogger(object):
             thread.start()
             
         # Wait for us to finish up
-        while not self._shutdown_event.is_set():
-            time.sleep(1)
+        while not self._shutdown_event.wait(1):
+            pass
             
         # Done
         for thread in threads:
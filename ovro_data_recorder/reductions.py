@@ -36,7 +36,7 @@ class ReductionOperation(object):
         if self.time_avg != 1:
             odata = idata.reshape(-1,self.time_avg,idata.shape[1],idata.shape[2],idata.shape[3])
             odata = numpy.mean(odata, axis=1)
-        if self.chan_avg:
+        if self.chan_avg != 1:
             odata = odata.reshape(odata.shape[0],odata.shape[1],-1,self.chan_avg,odata.shape[3])
             odata = numpy.mean(odata, axis=3)
         return odata
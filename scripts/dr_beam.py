@@ -537,6 +537,8 @@ def main(argv):
                         help='directory to save recorded files to')
     parser.add_argument('-q', '--record-directory-quota', type=quota_size, default=0,
                         help='quota for the recording directory, 0 disables the quota')
+    parser.add_argument('--compression', type=str, choices=('gzip', 'lzf'),
+                        help='compress the recorded HDF5 files; this may not keep up with full rate data')
     parser.add_argument('-f', '--fork', action='store_true',
                         help='fork and run in the background')
     args = parser.parse_args()
@@ -610,7 +612,8 @@ def main(argv):
                         beam=args.beam, ntime_gulp=args.gulp_size, core=cores.pop(0)))
     ops.append(GlobalLogger(log, mcs_id, args, QUEUE, quota=args.record_directory_quota,
                             threads=ops, gulp_time=args.gulp_size*24*(2*NCHAN/CLOCK)))  # Ugh, hard coded
-    ops.append(PowerBeamCommandProcessor(log, mcs_id, args.record_directory, QUEUE))
+    ops.append(PowerBeamCommandProcessor(log, mcs_id, args.record_directory, QUEUE,
+                                         compression=args.compression))
     
     # Setup the threads
     threads = [threading.Thread(target=op.main, name=type(op).__name__) for op in ops]
@@ -14,6 +14,34 @@ from datetime import datetime
 path = os.path.dirname(sys.executable)
 
 
+def _strip_generated(service):
+    """
+    Remove the "# Generated:" timestamp line from a rendered service so that
+    two renderings of the same configuration compare equal.
+    """
+    
+    return [line for line in service.splitlines() if not line.startswith('# Generated:')]
+
+
+def write_service(filename, service):
+    """
+    Write the rendered service to `filename`, leaving the file untouched if
+    it already has the same content apart from the generation timestamp.
+    Returns True if the file was written, False otherwise.
+    """
+    
+    try:
+        with open(filename, 'r') as fh:
+            if _strip_generated(fh.read()) == _strip_generated(service):
+                return False
+    except FileNotFoundError:
+        pass
+        
+    with open(filename, 'w') as fh:
+        fh.write(service)
+    return True
+
+
 def main(args):
     # Load in the configuration
     with open(args.config, 'r') as fh:
@@ -37,7 +65,9 @@ def main(args):
        
     # Render
     loader = jinja2.FileSystemLoader(searchpath='./')
-    env = jinja2.Environment(loader=loader)
+    ## The templates do not change while we run so skip the reload checks
+    ## and keep every parsed template around
+    env = jinja2.Environment(loader=loader, auto_reload=False, cache_size=-1)
 
     ## Power beams
     if args.power_beams:
@@ -63,13 +93,12 @@ def main(args):
                 service = template.render(path=path, anaconda=anaconda, condaenv=condaenv,
                                           beam=beam, address=address, port=port,
                                           directory=directory, quota=quota, logdir=logdir,
-                                          cores=','.join([str(v) for v in cores]),
+                                          cores=','.join(map(str, cores)),
                                           generated=generated, input_file=input_file, input_file_md5=input_file_md5)
                 for c in range(len(cores)):
                     cores[c] += len(cores)
                     cores[c] %= 96
-                with open('dr-beam-%s.service' % beam, 'w') as fh:
-                    fh.write(service)
+                write_service('dr-beam-%s.service' % beam, service)
 
     ## Slow visibilities
     if args.slow_visibilities:
@@ -97,13 +126,12 @@ def main(args):
                 service = template.render(path=path, anaconda=anaconda, condaenv=condaenv,
                                           band=band, address=address, port=port,
                                           directory=directory, quota=quota, logdir=logdir,
-                                          cores=','.join([str(v) for v in cores]),
+                                          cores=','.join(map(str, cores)),
                                           generated=generated, input_file=input_file, input_file_md5=input_file_md5)
                 for c in range(len(cores)):
                     cores[c] += len(cores)
                     cores[c] %= 96
-                with open('dr-vslow-%s.service' % band, 'w') as fh:
-                    fh.write(service)
+                write_service('dr-vslow-%s.service' % band, service)
 
             ### Manager
             template = env.get_template('dr-manager-vslow-base.service')
@@ -120,8 +148,7 @@ def main(args):
             service = template.render(path=path, anaconda=anaconda, condaenv=condaenv,
                                       band_id=band_id, logdir=config['manager']['fast_vis']['logdir'],
                                       generated=generated, input_file=input_file, input_file_md5=input_file_md5)
-            with open('dr-manager-vslow.service', 'w') as fh:
-                fh.write(service)
+            write_service('dr-manager-vslow.service', service)
 
     ## Fast visibilities
     if args.fast_visibilities:
@@ -149,13 +176,12 @@ def main(args):
                 service = template.render(path=path, anaconda=anaconda, condaenv=condaenv,
                                           band=band, address=address, port=port,
                                           directory=directory, quota=quota, logdir=logdir,
-                                          cores=','.join([str(v) for v in cores]),
+                                          cores=','.join(map(str, cores)),
                                           generated=generated, input_file=input_file, input_file_md5=input_file_md5)
                 for c in range(len(cores)):
                     cores[c] += len(cores)
                     cores[c] %= 96
-                with open('dr-vfast-%s.service' % band, 'w') as fh:
-                    fh.write(service)
+                write_service('dr-vfast-%s.service' % band, service)
                     
             ### Manager
             template = env.get_template('dr-manager-vfast-base.service')
@@ -172,8 +198,7 @@ def main(args):
             service = template.render(path=path, anaconda=anaconda, condaenv=condaenv,
                                       band_id=band_id, logdir=config['manager']['fast_vis']['logdir'],
                                       generated=generated, input_file=input_file, input_file_md5=input_file_md5)
-            with open('dr-manager-vfast.service', 'w') as fh:
-                fh.write(service)
+            write_service('dr-manager-vfast.service', service)
                 
     ## T-engines
     if args.t_engines:
@@ -196,8 +221,7 @@ def main(args):
                                           address=address, port=port,
                                           directory=directory, quota=quota, logdir=logdir,
                                           generated=generated, input_file=input_file, input_file_md5=input_file_md5)
-                with open('dr-tengine.service', 'w') as fh:
-                    fh.write(service)
+                write_service('dr-tengine.service', service)
                     
     if not args.clean:
         print("To enable/update these services:")
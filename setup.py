@@ -1,6 +1,7 @@
 import os
 import glob
-from subprocess import check_call, check_output, CalledProcessError
+import functools
+from subprocess import check_output, CalledProcessError
 from setuptools import setup, Extension, find_namespace_packages
 
 try:
@@ -9,6 +10,43 @@ except Exception as e:
     raise RuntimeError(f"numpy is required to run setup.py: {str(e)}")
 
 
+def read_git_head(repo_dir):
+    """
+    Find the current branch and commit hash by reading the .git directory in
+    `repo_dir` directly.  The branch is empty for a detached HEAD.  Raises
+    OSError or ValueError if the repository layout is not understood, e.g.,
+    for a worktree or submodule where .git is a file.
+    """
+    
+    git_dir = os.path.join(repo_dir, '.git')
+    if not os.path.isdir(git_dir):
+        raise ValueError(f"'{git_dir}' is not a directory")
+        
+    with open(os.path.join(git_dir, 'HEAD'), 'r') as fh:
+        head = fh.read().strip()
+    if not head.startswith('ref: '):
+        return '', head
+        
+    ref = head[5:]
+    git_branch = ref[len('refs/heads/'):] if ref.startswith('refs/heads/') else ref
+    try:
+        with open(os.path.join(git_dir, ref), 'r') as fh:
+            git_hash = fh.read().strip()
+    except FileNotFoundError:
+        ## The ref may only be in packed-refs
+        git_hash = None
+        with open(os.path.join(git_dir, 'packed-refs'), 'r') as fh:
+            for line in fh:
+                fields = line.split()
+                if len(fields) == 2 and fields[1] == ref:
+                    git_hash = fields[0]
+                    break
+        if git_hash is None:
+            raise ValueError(f"Cannot find ref '{ref}'")
+    return git_branch, git_hash
+
+
+@functools.lru_cache(maxsize=1)
 def get_version():
     """Determine a version based on the git repo info."""
     
@@ -20,28 +58,26 @@ def get_version():
     # return an un-altered "official" version
     repo_version = 'unknown'
     try:
-        git_branch = check_output(['git', 'branch', '--show-current'],
-                                  cwd=os.path.dirname(__file__))
-        git_branch = git_branch.decode().strip().rstrip()
+        try:
+            git_branch, git_hash = read_git_head(os.path.dirname(os.path.abspath(__file__)))
+        except (OSError, ValueError):
+            ## Fall back to asking git
+            git_branch = check_output(['git', 'branch', '--show-current'],
+                                      cwd=os.path.dirname(__file__))
+            git_branch = git_branch.decode().strip().rstrip()
+            
+            git_hash = check_output(['git', 'log', '-n', '1', '--pretty=format:%H'],
+                                    cwd=os.path.dirname(__file__))
+            git_hash = git_hash.decode().strip().rstrip()
         if os.getenv('READTHEDOCS', None) is not None:
             git_branch = 'rtd'
             
-        git_hash = check_output(['git', 'log', '-n', '1', '--pretty=format:%H'],
-                                cwd=os.path.dirname(__file__))
-        git_hash = git_hash.decode().strip().rstrip()
+        ## One status call covers both staged and unstaged changes to tracked
+        ## files
+        git_status = check_output(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                  cwd=os.path.dirname(__file__))
+        git_dirty = len(git_status.strip())
         
-        git_dirty = 0
-        try:
-            check_call(['git', 'diff-index', '--quiet', '--cached', 'HEAD', '--'],
-                       cwd=os.path.dirname(__file__))
-        except CalledProcessError:
-            git_dirty += 1
-        try:
-            check_call(['git', 'diff-files', '--quiet'],
-                       cwd=os.path.dirname(__file__))
-        except CalledProcessError:
-            git_dirty += 1
-            
         repo_version = git_branch+'.'+git_hash[:7]
         if git_dirty > 0:
             repo_version += '.dirty'
@@ -74,7 +110,8 @@ local_version = '{odrLocalVersion}'
 ExtensionModules = [Extension('gridder', ['ovro_data_recorder/gridder.cpp',],
                               include_dirs=[np.get_include()],
                               libraries=['m', 'fftw3f'],
-                              extra_compile_args=['-DNPY_NO_DEPRECATED_API=NPY_1_7_API_VERSION',]),]
+                              extra_compile_args=['-O3', '-march=native',
+                                                  '-DNPY_NO_DEPRECATED_API=NPY_1_7_API_VERSION',]),]
 
 
 # Update the version information